@@ -121,6 +121,15 @@ options:
     required: false
     aliases:
       - volumes
+  max_matches:
+    description:
+      - The maximum number of matched data sets to return. The first
+        data sets in name order are returned.
+      - When no other filter has to be applied to the matched data sets, the
+        search stops as soon as this many data sets have been found.
+    type: int
+    required: false
+    version_added: "1.4.0"
 notes:
   - Only cataloged data sets will be searched. If an uncataloged data set needs to
     be searched, it should be cataloged first. The M(zos_data_set) module can be
@@ -209,7 +218,9 @@ data_sets:
       }
     ]
 matched:
-    description: The number of matched data sets found.
+    description:
+      - The number of matched data sets found.
+      - When I(max_matches) is provided, this is at most I(max_matches).
     returned: success
     type: int
     sample: 49
@@ -245,12 +256,18 @@ import time
 import datetime
 import math
 
-from copy import deepcopy
-from re import match as fullmatch
+from concurrent.futures import ThreadPoolExecutor
+from subprocess import Popen, PIPE
+from tempfile import TemporaryFile
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
 
 
-from ansible.module_utils.six import PY3
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils._text import to_native
 
 from ansible_collections.ibm.ibm_zos_core.plugins.module_utils import (
     vtoc, mvs_cmd
@@ -260,14 +277,23 @@ from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.better_arg_parser
     BetterArgParser
 )
 
-from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.ansible_module import (
-    AnsibleModuleHelper
-)
+try:
+    from zoautil_py import ZOAU_API_VERSION
+except Exception:
+    ZOAU_API_VERSION = None
+
+# The first ZOAU version whose 'dls' can list VSAM data sets ('dls -t vsam')
+_DLS_VSAM_VERSION = (1, 4, 0)
+
+# Upper bound on the number of ZOAU commands run concurrently
+_MAX_WORKERS = 16
+
+# Number of data set names passed to a single 'dls' invocation, which keeps
+# the command line well within the system's argument length limit
+_DLS_BATCH_SIZE = 256
 
-if PY3:
-    from shlex import quote
-else:
-    from pipes import quote
+# The DSORG of each data set looked up by _ds_type during a search
+_DS_TYPES = dict()
 
 
 def content_filter(module, patterns, content):
@@ -286,39 +312,45 @@ def content_filter(module, patterns, content):
         data sets examined.
     """
     filtered_data_sets = dict(ps=set(), pds=dict(), searched=0)
-    for pattern in patterns:
-        rc, out, err = _dgrep_wrapper(
-            pattern, content=content, verbose=True, ignore_case=True
+    rc, out, err = _dgrep_wrapper(
+        module, patterns, content=content, verbose=True, ignore_case=True
+    )
+    if rc > 4 and rc != 28:
+        module.fail_json(
+            msg="Non-zero return code received while executing ZOAU shell command 'dgrep'",
+            rc=rc, stdout=out, stderr=err
         )
-        if rc > 4 and rc != 28:
-            module.fail_json(
-                msg="Non-zero return code received while executing ZOAU shell command 'dgrep'",
-                rc=rc, stdout=out, stderr=err
-            )
-        for line in err.splitlines():
-            if line and line.strip().startswith("BGYSC1005I"):
-                filtered_data_sets['searched'] += 1
-
-        for line in out.splitlines():
-            if line:
-                line = line.split()
-                ds_name = line[0]
-                if _ds_type(ds_name) == "PO":
-                    try:
-                        filtered_data_sets['pds'][ds_name].add(line[1])
-                    except KeyError:
-                        filtered_data_sets['pds'][ds_name] = set([line[1]])
-                else:
-                    filtered_data_sets['ps'].add(ds_name)
+    for line in err.splitlines():
+        if line and line.strip().startswith("BGYSC1005I"):
+            filtered_data_sets['searched'] += 1
+
+    # Only the first hit in each data set or member is needed. Later hits
+    # are skipped before the data set type is looked up.
+    for line in out.splitlines():
+        if line:
+            line = line.split()
+            ds_name = line[0]
+            if ds_name in filtered_data_sets['ps']:
+                continue
+            if len(line) > 1 and line[1] in filtered_data_sets['pds'].get(ds_name, ()):
+                continue
+            if _ds_type(ds_name) == "PO":
+                try:
+                    filtered_data_sets['pds'][ds_name].add(line[1])
+                except KeyError:
+                    filtered_data_sets['pds'][ds_name] = set([line[1]])
+            else:
+                filtered_data_sets['ps'].add(ds_name)
     return filtered_data_sets
 
 
-def data_set_filter(module, pds_paths, patterns):
+def data_set_filter(module, pds_paths, patterns, limit=None):
     """ Find data sets that match any pattern in a list of patterns.
 
     Arguments:
         module {AnsibleModule} -- The Ansible module object being used
         patterns {list[str]} -- A list of data set patterns
+        limit {int} -- Stop listing data sets once this many have been found
 
     Returns:
         dict[ps=set, pds=dict[str, str], searched=int] -- A dictionary containing
@@ -328,41 +360,105 @@ def data_set_filter(module, pds_paths, patterns):
     """
     filtered_data_sets = dict(ps=set(), pds=dict(), searched=0)
     patterns = pds_paths or patterns
-    for pattern in patterns:
-        rc, out, err = _dls_wrapper(pattern, list_details=True)
-        if rc != 0:
-            if "BGYSC1103E" in err:
-                return filtered_data_sets
-
+    pds_names = []
+    truncated = False
+
+    # The 'dls' listing can be very large for broad patterns, so its output
+    # is consumed one line at a time rather than buffered as a whole.
+    # Output is decoded the same way run_command decodes it, so that names
+    # which are not valid UTF-8 do not abort the listing.
+    with TemporaryFile() as err_file:
+        try:
+            dls_proc = Popen(
+                _dls_command(patterns, list_details=True),
+                stdout=PIPE, stderr=err_file
+            )
+        except OSError as err:
             module.fail_json(
-                msg="Non-zero return code received while executing ZOAU shell command 'dls'",
-                rc=rc, stdout=out, stderr=err
+                msg="Unable to run ZOAU shell command 'dls'", stderr=str(err)
             )
-        for ds in err.splitlines():
-            if ds and ds.strip().startswith("BGYSC1005I"):
-                filtered_data_sets['searched'] += 1
-
-        for line in out.splitlines():
-            result = line.split()
+        for line in dls_proc.stdout:
+            result = to_native(line, errors="surrogate_or_strict").split()
             if result:
                 if result[1] == "PO":
                     if pds_paths:
-                        mls_rc, mls_out, mls_err = module.run_command(
-                            "mls '{0}(*)'".format(result[0])
-                        )
-                        if mls_rc == 2:
-                            filtered_data_sets["pds"][result[0]] = {}
-                        else:
-                            filtered_data_sets["pds"][result[0]] = \
-                                set(filter(None, mls_out.splitlines()))
+                        pds_names.append(result[0])
                     else:
                         filtered_data_sets["pds"][result[0]] = {}
                 else:
                     filtered_data_sets["ps"].add(result[0])
+                if limit and len(filtered_data_sets["ps"]) + len(filtered_data_sets["pds"]) >= limit:
+                    truncated = True
+                    dls_proc.kill()
+                    break
+        dls_proc.stdout.close()
+        rc = dls_proc.wait()
+        err_file.seek(0)
+        err = to_native(err_file.read(), errors="surrogate_or_strict")
+
+    # A BGYSC1103E error only means that one of the patterns had no match,
+    # the output still holds the data sets matched by the other patterns.
+    if rc != 0 and not truncated and "BGYSC1103E" not in err:
+        module.fail_json(
+            msg="Non-zero return code received while executing ZOAU shell command 'dls'",
+            rc=rc, stderr=err
+        )
+    for ds in err.splitlines():
+        if ds and ds.strip().startswith("BGYSC1005I"):
+            filtered_data_sets['searched'] += 1
+
+    if pds_names:
+        filtered_data_sets["pds"].update(
+            zip(pds_names, _list_pds_members(module, pds_names))
+        )
     return filtered_data_sets
 
 
-def pds_filter(module, pds_dict, member_patterns, excludes=None):
+def _list_pds_members(module, pds_names):
+    """ List the members of several PDS/PDSE. Listing the members of each
+    data set is independent of the others, so the 'mls' invocations are
+    spread over a bounded thread pool. 'mls' is located, and the first
+    data set listed, before the pool is started, so that a failure to run
+    it is reported once rather than by every thread.
+
+    Arguments:
+        module {AnsibleModule} -- The Ansible module object being used
+        pds_names {list[str]} -- The names of the PDS/PDSE
+
+    Returns:
+        list[set[str]] -- The members of each PDS/PDSE, in the order of pds_names
+    """
+    mls = module.get_bin_path("mls", required=True)
+    members = [_pds_members(module, mls, pds_names[0])]
+    if len(pds_names) > 1:
+        workers = min(_MAX_WORKERS, len(pds_names) - 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            members.extend(
+                executor.map(lambda pds: _pds_members(module, mls, pds), pds_names[1:])
+            )
+    return members
+
+
+def _pds_members(module, mls, pds):
+    """ List the members of a PDS/PDSE.
+
+    Arguments:
+        module {AnsibleModule} -- The Ansible module object being used
+        mls {str} -- The path of the 'mls' command
+        pds {str} -- The name of the PDS/PDSE
+
+    Returns:
+        set[str] -- The members of the PDS/PDSE
+    """
+    mls_rc, mls_out, mls_err = module.run_command([mls, "{0}(*)".format(pds)])
+    if mls_rc == 2:
+        return {}
+    return set(filter(None, mls_out.splitlines()))
+
+
+def pds_filter(
+    module, pds_dict, member_patterns, excludes=None, prefixes=None, exclude_prefixes=None
+):
     """ Return all PDS/PDSE data sets whose members match any of the patterns
     in the given list of member patterns.
 
@@ -371,33 +467,42 @@ def pds_filter(module, pds_dict, member_patterns, excludes=None):
         pds_dict {dict[str, str]} -- A dictionary where each key is the name of
                                     of the PDS/PDSE and the value is a list of
                                     members belonging to the PDS/PDSE
-        member_patterns {list} -- A list of member patterns to search for
+        member_patterns {list[re.Pattern]} -- A list of compiled member patterns
+                                             to search for
+        excludes {list[re.Pattern]} -- A list of compiled member patterns
+                                       to be excluded
+        prefixes {tuple[str]} -- Uppercase literal prefixes of the member
+                                 patterns. Members that start with none of
+                                 them are skipped without being matched.
+        exclude_prefixes {tuple[str]} -- Uppercase literal prefixes of the
+                                         exclude patterns
 
     Returns:
         dict[str, set[str]] -- Filtered PDS/PDSE with corresponding members
     """
     filtered_pds = dict()
     for pds, members in pds_dict.items():
-        for m in members:
+        for m in _prefix_candidates(members, prefixes):
             for mem_pat in member_patterns:
-                if _match_regex(module, mem_pat, m):
+                if mem_pat.match(m):
                     try:
                         filtered_pds[pds].add(m)
                     except KeyError:
                         filtered_pds[pds] = set({m})
     # ************************************************************************
     # Exclude any member that matches a given pattern in 'excludes'.
-    # Changes will be made to 'filtered_pds' each iteration. Therefore,
-    # iteration should be performed over a copy of 'filtered_pds'. Because
-    # Python performs a shallow copy when copying a dictionary, a deep copy
-    # should be performed.
+    # Changes will be made to the member sets in 'filtered_pds' each
+    # iteration. Therefore, iteration should be performed over a list of
+    # candidate members, which also drops members that cannot match any
+    # of the exclude patterns.
     # ************************************************************************
     if excludes:
-        for pds, members in deepcopy(filtered_pds).items():
-            for m in members:
+        for pds, members in filtered_pds.items():
+            candidates = _prefix_candidates(members, exclude_prefixes)
+            for m in candidates:
                 for ex_pat in excludes:
-                    if _match_regex(module, ex_pat, m):
-                        filtered_pds[pds].remove(m)
+                    if ex_pat.match(m):
+                        members.remove(m)
                         break
     return filtered_pds
 
@@ -415,24 +520,35 @@ def vsam_filter(module, patterns, resource_type, age=None):
     """
     filtered_data_sets = set()
     now = time.time()
-    for pattern in patterns:
-        rc, out, err = _vls_wrapper(pattern, details=True)
+    # 'dls -u' reports the referenced date in the second column, which
+    # is the same position used for the date reported by 'vls -l'.
+    if _zoau_version() >= _DLS_VSAM_VERSION:
+        # 'dls -u' reports the referenced date in the second column, which
+        # is the same position used for the date reported by 'vls -l'.
+        rc, out, err = _dls_wrapper(module, patterns, u_time=True, ds_type="vsam")
+        if rc != 0 and "BGYSC1103E" not in err:
+            module.fail_json(
+                msg="Non-zero return code received while executing ZOAU shell command 'dls'",
+                rc=rc, stdout=out, stderr=err
+            )
+    else:
+        rc, out, err = _vls_wrapper(module, patterns, details=True)
         if rc > 4:
             module.fail_json(
                 msg="Non-zero return code received while executing ZOAU shell command 'vls'",
                 rc=rc, stdout=out, stderr=err
             )
-        for entry in out.splitlines():
-            if entry:
-                vsam_props = entry.split()
-                vsam_name = vsam_props[0]
-                vsam_type = vsam_name.split('.')[-1]
-                if _match_resource_type(resource_type, vsam_type):
-                    if age:
-                        if _age_filter(vsam_props[1], now, age):
-                            filtered_data_sets.add(vsam_name)
-                    else:
+    for entry in out.splitlines():
+        if entry:
+            vsam_props = entry.split()
+            vsam_name = vsam_props[0]
+            vsam_type = vsam_name.split('.')[-1]
+            if _match_resource_type(resource_type, vsam_type):
+                if age:
+                    if _age_filter(vsam_props[1], now, age):
                         filtered_data_sets.add(vsam_name)
+                else:
+                    filtered_data_sets.add(vsam_name)
     return filtered_data_sets
 
 
@@ -451,30 +567,43 @@ def data_set_attribute_filter(
         set[str] -- Matched data sets filtered by age and size
     """
     filtered_data_sets = set()
+    if not data_sets:
+        return filtered_data_sets
+
     now = time.time()
-    for ds in data_sets:
+    names = list(data_sets)
+    output = []
+    for start in range(0, len(names), _DLS_BATCH_SIZE):
         rc, out, err = _dls_wrapper(
-            ds, u_time=age is not None, size=size is not None
+            module,
+            names[start:start + _DLS_BATCH_SIZE],
+            u_time=age is not None,
+            size=size is not None
         )
         if rc != 0:
             module.fail_json(
                 msg="Non-zero return code received while executing ZOAU shell command 'dls'",
                 rc=rc, stdout=out, stderr=err
             )
-        out = out.strip().split()
-        ds_age = out[1] if age_stamp == "ref_date" else _get_creation_date(module, ds)
+        output.extend(out.splitlines())
+    for line in output:
+        line = line.split()
+        if not line or line[0] not in data_sets:
+            continue
+        ds = line[0]
+        ds_age = line[1] if age_stamp == "ref_date" else _get_creation_date(module, ds)
         if (
             (
                 age
                 and size
                 and _age_filter(ds_age, now, age)
-                and _size_filter(int(out[6]), size)
+                and _size_filter(int(line[6]), size)
             ) or
             (
                 age and not size and _age_filter(ds_age, now, age)
             ) or
             (
-                size and not age and _size_filter(int(out[5]), size)
+                size and not age and _size_filter(int(line[5]), size)
             )
         ):
             filtered_data_sets.add(ds)
@@ -497,6 +626,9 @@ def volume_filter(module, data_sets, volumes):
         set[str] -- The filtered data sets
     """
     filtered_data_sets = set()
+    if not data_sets:
+        return filtered_data_sets
+
     for volume in volumes:
         vtoc_entry = vtoc.get_volume_entry(volume)
         if vtoc_entry:
@@ -511,20 +643,23 @@ def volume_filter(module, data_sets, volumes):
     return filtered_data_sets
 
 
-def exclude_data_sets(module, data_set_list, excludes):
+def exclude_data_sets(module, data_set_list, excludes, prefixes=None):
     """Remove data sets that match any pattern in a list of patterns
 
     Arguments:
         module {AnsibleModule} -- The Ansible module object being used
         data_set_list {set[str]} -- A set of data sets to be filtered
-        excludes {list[str]} -- A list of data set patterns to be excluded
+        excludes {list[re.Pattern]} -- A list of compiled data set patterns
+                                       to be excluded
+        prefixes {tuple[str]} -- Uppercase literal prefixes of the exclude
+                                 patterns
 
     Returns:
         set[str] -- The remaining data sets that have not been excluded
     """
-    for ds in set(data_set_list):
+    for ds in _prefix_candidates(data_set_list, prefixes):
         for ex_pat in excludes:
-            if _match_regex(module, ex_pat, ds):
+            if ex_pat.match(ds):
                 data_set_list.remove(ds)
                 break
     return data_set_list
@@ -606,85 +741,206 @@ def _size_filter(ds_size, size):
     return False
 
 
-def _match_regex(module, pattern, string):
-    """ Determine whether the input regex pattern matches the string
+def _compile_patterns(module, patterns):
+    """ Compile each regex pattern in the input list once, so that the
+    compiled objects can be reused for every name being matched. Where
+    possible, the patterns are folded into a single alternation.
 
     Arguments:
         module {AnsibleModule} -- The Ansible module object being used
-        pattern {str} -- The regular expression to match
-        string {str} -- The string to match
+        patterns {list[str]} -- The regular expressions to compile
 
     Returns:
-        re.Match -- A Match object that matches the pattern to string
+        tuple[re.Pattern] -- The compiled patterns
     """
+    compiled = []
+    for pattern in patterns or []:
+        try:
+            compiled.append(re.compile(pattern, re.IGNORECASE))
+        except re.error as err:
+            module.fail_json(
+                msg="Invalid regular expression '{0}'".format(pattern),
+                stderr=repr(err)
+            )
+    return _combine_patterns(tuple(compiled))
+
+
+def _remove_duplicates(patterns):
+    """ Remove repeated entries from a list of patterns, keeping the
+    order in which they were first given.
+
+    Arguments:
+        patterns {list[str]} -- The patterns, or None
+
+    Returns:
+        list[str] -- The unique patterns, or None if no patterns were given
+    """
+    if not patterns:
+        return patterns
+    return list(dict.fromkeys(patterns))
+
+
+def _prefix_candidates(names, prefixes):
+    """ Return the names that start with one of the given literal prefixes.
+    The names are filtered in a single pass, ahead of any regex matching.
+
+    Arguments:
+        names {iterable[str]} -- The names to filter
+        prefixes {tuple[str]} -- Uppercase literal prefixes, or None to
+                                 keep every name
+
+    Returns:
+        list[str] -- The names that may match
+    """
+    if not prefixes:
+        return list(names)
+    return [name for name in names if name.upper().startswith(prefixes)]
+
+
+def _literal_prefixes(patterns):
+    """ Extract the literal prefix of each regex pattern, so that names
+    which cannot match any of the patterns can be rejected with a cheap
+    string comparison.
+
+    Arguments:
+        patterns {list[str]} -- The regular expressions
+
+    Returns:
+        tuple[str] -- The uppercase literal prefixes, or None if at least
+                      one of the patterns does not start with a literal
+    """
+    prefixes = set()
+    for pattern in patterns or []:
+        prefix = []
+        try:
+            parsed = sre_parse.parse(pattern)
+        except re.error:
+            return None
+        for index, (op, av) in enumerate(parsed):
+            if index == 0 and op == sre_parse.AT and av == sre_parse.AT_BEGINNING:
+                continue
+            if op != sre_parse.LITERAL:
+                break
+            prefix.append(chr(av))
+        if not prefix:
+            return None
+        prefixes.add("".join(prefix).upper())
+    return tuple(prefixes) or None
+
+
+def _combine_patterns(compiled):
+    """ Fold a list of compiled patterns into a single alternation, so that
+    a name is tested against all of the patterns in one scan. Patterns that
+    define groups or carry differing inline flags are returned unchanged,
+    since joining them could alter their meaning.
+
+    Arguments:
+        compiled {tuple[re.Pattern]} -- The compiled patterns
+
+    Returns:
+        tuple[re.Pattern] -- A single combined pattern, or the input patterns
+    """
+    if len(compiled) < 2:
+        return compiled
+    if any(pat.groups for pat in compiled) or len(set(pat.flags for pat in compiled)) > 1:
+        return compiled
     try:
-        return fullmatch(pattern, string, re.IGNORECASE)
-    except re.error as err:
-        module.fail_json(
-            msg="Invalid regular expression '{0}'".format(pattern),
-            stderr=repr(err)
+        return (
+            re.compile(
+                "|".join("(?:{0})".format(pat.pattern) for pat in compiled),
+                compiled[0].flags
+            ),
         )
+    except re.error:
+        return compiled
 
 
 def _dgrep_wrapper(
-    data_set_pattern,
+    module,
+    data_set_patterns,
     content,
     ignore_case=False,
     line_num=False,
     verbose=False,
     context=None
 ):
-    """A wrapper for ZOAU 'dgrep' shell command"""
-    dgrep_cmd = "dgrep"
+    """A wrapper for ZOAU 'dgrep' shell command. All of the data set
+    patterns are searched by a single invocation of 'dgrep'."""
+    dgrep_cmd = ["dgrep"]
     if ignore_case:
-        dgrep_cmd += " -i"
+        dgrep_cmd.append("-i")
     if line_num:
-        dgrep_cmd += " -n"
+        dgrep_cmd.append("-n")
     if verbose:
-        dgrep_cmd += " -v"
+        dgrep_cmd.append("-v")
     if context:
-        dgrep_cmd += " -C{0}".format(context)
+        dgrep_cmd.append("-C{0}".format(context))
+
+    dgrep_cmd.append(content)
+    dgrep_cmd.extend(data_set_patterns)
+    return module.run_command(dgrep_cmd)
+
 
-    dgrep_cmd += " {0} {1}".format(quote(content), quote(data_set_pattern))
-    return AnsibleModuleHelper(argument_spec={}).run_command(dgrep_cmd)
+def _dls_wrapper(module, data_set_patterns, **kwargs):
+    """A wrapper for ZOAU 'dls' shell command. All of the data set
+    patterns are listed by a single invocation of 'dls'."""
+    return module.run_command(_dls_command(data_set_patterns, **kwargs))
 
 
-def _dls_wrapper(
-    data_set_pattern,
+def _dls_command(
+    data_set_patterns,
     list_details=False,
     u_time=False,
     size=False,
     verbose=False,
-    migrated=False
+    migrated=False,
+    ds_type=None
 ):
-    """A wrapper for ZOAU 'dls' shell command"""
-    dls_cmd = "dls"
+    """Build the argument list for ZOAU 'dls' shell command"""
+    dls_cmd = ["dls"]
+    if ds_type:
+        dls_cmd.extend(["-t", ds_type])
     if migrated:
-        dls_cmd += " -m"
+        dls_cmd.append("-m")
     else:
         if list_details:
-            dls_cmd += " -l"
+            dls_cmd.append("-l")
         if u_time:
-            dls_cmd += " -u"
+            dls_cmd.append("-u")
         if size:
-            dls_cmd += " -s"
+            dls_cmd.append("-s")
     if verbose:
-        dls_cmd += " -v"
+        dls_cmd.append("-v")
 
-    dls_cmd += " {0}".format(quote(data_set_pattern))
-    return AnsibleModuleHelper(argument_spec={}).run_command(dls_cmd)
+    dls_cmd.extend(data_set_patterns)
+    return dls_cmd
 
 
-def _vls_wrapper(pattern, details=False, verbose=False):
-    """A wrapper for ZOAU 'vls' shell command"""
-    vls_cmd = "vls"
+def _vls_wrapper(module, patterns, details=False, verbose=False):
+    """A wrapper for ZOAU 'vls' shell command. All of the patterns are
+    listed by a single invocation of 'vls'. Only used when the installed
+    ZOAU is too old to list VSAM data sets with 'dls -t vsam'."""
+    vls_cmd = ["vls"]
     if details:
-        vls_cmd += " -l"
+        vls_cmd.append("-l")
     if verbose:
-        vls_cmd += " -v"
+        vls_cmd.append("-v")
 
-    vls_cmd += " {0}".format(quote(pattern))
-    return AnsibleModuleHelper(argument_spec={}).run_command(vls_cmd)
+    vls_cmd.extend(patterns)
+    return module.run_command(vls_cmd)
+
+
+def _zoau_version():
+    """Determine the version of the installed ZOAU from the version of its
+    Python API, so that no command needs to be run.
+
+    Returns:
+        tuple[int] -- The ZOAU version, or (0, 0, 0) if it is unknown
+    """
+    version = re.match(r"V?(\d+)\.(\d+)\.(\d+)", str(ZOAU_API_VERSION or ""))
+    if not version:
+        return (0, 0, 0)
+    return tuple(int(v) for v in version.groups())
 
 
 def _match_resource_type(type1, type2):
@@ -696,7 +952,22 @@ def _match_resource_type(type1, type2):
 
 
 def _ds_type(ds_name):
-    """Utility function to determine the DSORG of a data set
+    """Utility function to determine the DSORG of a data set. The result
+    is kept in _DS_TYPES per data set name, since LISTDS is expensive.
+
+    Arguments:
+        ds_name {str} -- The name of the data set
+
+    Returns:
+        str -- The DSORG of the data set
+    """
+    if ds_name not in _DS_TYPES:
+        _DS_TYPES[ds_name] = _listds_dsorg(ds_name)
+    return _DS_TYPES[ds_name]
+
+
+def _listds_dsorg(ds_name):
+    """Run LISTDS for a data set and return the DSORG that it reports.
 
     Arguments:
         ds_name {str} -- The name of the data set
@@ -719,16 +990,19 @@ def run_module(module):
     age = module.params.get('age')
     age_stamp = module.params.get('age_stamp')
     contains = module.params.get('contains')
-    excludes = module.params.get('excludes') or module.params.get('exclude')
+    excludes = module.params.get('excludes')
     patterns = module.params.get('patterns')
     size = module.params.get('size')
-    pds_paths = (
-        module.params.get('pds_paths')
-        or module.params.get('pds_patterns')
-        or module.params.get('pds_pattern')
-    )
+    pds_paths = module.params.get('pds_patterns')
     resource_type = module.params.get('resource_type').upper()
-    volume = module.params.get('volume') or module.params.get('volumes')
+    volume = module.params.get('volume')
+    max_matches = module.params.get('max_matches')
+
+    # Repeated patterns would only add redundant work to every search
+    patterns = _remove_duplicates(patterns)
+    excludes = _remove_duplicates(excludes)
+    pds_paths = _remove_duplicates(pds_paths)
+    volume = _remove_duplicates(volume)
 
     res_args = dict(data_sets=[])
     filtered_data_sets = set()
@@ -752,6 +1026,16 @@ def run_module(module):
         else:
             module.fail_json(size=size, msg="failed to process size")
 
+    if max_matches is not None and max_matches < 1:
+        module.fail_json(
+            max_matches=max_matches, msg="max_matches must be a positive integer"
+        )
+
+    # Compile the member and exclude patterns once; they are matched against
+    # every member or data set name returned by the search.
+    compiled_excludes = _compile_patterns(module, excludes)
+    exclude_prefixes = _literal_prefixes(excludes)
+
     if resource_type == "NONVSAM":
         if contains:
             init_filtered_data_sets = content_filter(
@@ -760,30 +1044,41 @@ def run_module(module):
                 contains
             )
         else:
+            # The listing can only stop early when no later filter could
+            # remove any of the data sets found so far.
+            can_stop_early = not (pds_paths or volume or size or age or excludes)
             init_filtered_data_sets = data_set_filter(
                 module,
                 pds_paths,
-                patterns
+                patterns,
+                limit=max_matches if can_stop_early else None
             )
         if pds_paths:
             filtered_pds = pds_filter(
-                module, init_filtered_data_sets.get("pds"), patterns, excludes=excludes
+                module,
+                init_filtered_data_sets.get("pds"),
+                _compile_patterns(module, patterns),
+                excludes=compiled_excludes,
+                prefixes=_literal_prefixes(patterns),
+                exclude_prefixes=exclude_prefixes
             )
             filtered_data_sets = set(filtered_pds.keys())
         else:
             filtered_data_sets = \
                 init_filtered_data_sets.get("ps").union(set(init_filtered_data_sets['pds'].keys()))
 
+        # Filter data sets by volume before probing the attributes of each
+        # data set, so that age and size are only gathered for data sets
+        # that can still be part of the result.
+        if volume:
+            filtered_data_sets = volume_filter(module, filtered_data_sets, volume)
+
         # Filter data sets by age or size
         if size or age:
             filtered_data_sets = data_set_attribute_filter(
                 module, filtered_data_sets, size=size, age=age, age_stamp=age_stamp
             )
 
-        # Filter data sets by volume
-        if volume:
-            filtered_data_sets = volume_filter(module, filtered_data_sets, volume)
-
         res_args['examined'] = init_filtered_data_sets.get("searched")
 
     else:
@@ -792,9 +1087,15 @@ def run_module(module):
 
     # Filter out data sets that match one of the patterns in 'excludes'
     if excludes and not pds_paths:
-        filtered_data_sets = exclude_data_sets(module, filtered_data_sets, excludes)
+        filtered_data_sets = exclude_data_sets(
+            module, filtered_data_sets, compiled_excludes, prefixes=exclude_prefixes
+        )
 
-    for ds in filtered_data_sets:
+    # Sorted, so that the data sets kept by max_matches are the same on
+    # every run
+    for ds in sorted(filtered_data_sets):
+        if max_matches and len(res_args['data_sets']) >= max_matches:
+            break
         if resource_type == "NONVSAM":
             members = filtered_pds.get(ds) or init_filtered_data_sets['pds'].get(ds)
             if members:
@@ -806,64 +1107,64 @@ def run_module(module):
         else:
             res_args['data_sets'].append(dict(name=ds, type=resource_type))
 
-    res_args['matched'] = len(filtered_data_sets)
+    res_args['matched'] = len(res_args['data_sets'])
+    _DS_TYPES.clear()
     return res_args
 
 
-def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            age=dict(type="str", required=False),
-            age_stamp=dict(
-                type="str",
-                required=False,
-                choices=["creation_date", "ref_date"],
-                default="creation_date"
-            ),
-            contains=dict(type="str", required=False),
-            excludes=dict(type="list", required=False, aliases=["exclude"]),
-            patterns=dict(type="list", required=True),
-            size=dict(type="str", required=False),
-            pds_patterns=dict(
-                type="list",
-                required=False,
-                aliases=["pds_pattern", "pds_paths"]
-            ),
-            resource_type=dict(
-                type="str", required=False, default="nonvsam",
-                choices=["cluster", "data", "index", "nonvsam"]
-            ),
-            volume=dict(type="list", required=False, aliases=["volumes"])
+_ARGUMENT_SPEC = dict(
+    age=dict(type="str", required=False),
+    age_stamp=dict(
+        type="str",
+        required=False,
+        choices=["creation_date", "ref_date"],
+        default="creation_date"
+    ),
+    contains=dict(type="str", required=False),
+    excludes=dict(type="list", required=False, aliases=["exclude"]),
+    patterns=dict(type="list", required=True),
+    size=dict(type="str", required=False),
+    pds_patterns=dict(
+        type="list",
+        required=False,
+        aliases=["pds_pattern", "pds_paths"]
+    ),
+    resource_type=dict(
+        type="str", required=False, default="nonvsam",
+        choices=["cluster", "data", "index", "nonvsam"]
+    ),
+    volume=dict(type="list", required=False, aliases=["volumes"]),
+    max_matches=dict(type="int", required=False)
+)
+
+
+def _to_arg_def(argument_spec):
+    """Derive the BetterArgParser argument definitions from an
+    AnsibleModule argument spec, so both are built from one source.
+
+    Arguments:
+        argument_spec {dict} -- The AnsibleModule argument spec
+
+    Returns:
+        dict -- The BetterArgParser argument definitions
+    """
+    arg_def = dict()
+    for name, spec in argument_spec.items():
+        # BetterArgParser appends to 'aliases', so lists are copied to
+        # keep the AnsibleModule spec unchanged.
+        arg_def[name] = dict(
+            ("arg_type" if key == "type" else key,
+             list(value) if isinstance(value, list) else value)
+            for key, value in spec.items()
         )
-    )
+    return arg_def
+
+
+def main():
+    module = AnsibleModule(argument_spec=_ARGUMENT_SPEC)
 
-    arg_def = dict(
-        age=dict(arg_type="str", required=False),
-        age_stamp=dict(
-            arg_type="str",
-            required=False,
-            choices=["creation_date", "ref_date"],
-            default="creation_date"
-        ),
-        contains=dict(arg_type="str", required=False),
-        excludes=dict(arg_type="list", required=False, aliases=["exclude"]),
-        patterns=dict(arg_type="list", required=True),
-        size=dict(arg_type="str", required=False),
-        pds_patterns=dict(
-            arg_type="list",
-            required=False,
-            aliases=["pds_pattern", "pds_paths"]
-        ),
-        resource_type=dict(
-            arg_type="str",
-            required=False,
-            default="nonvsam",
-            choices=["cluster", "data", "index", "nonvsam"]
-        ),
-        volume=dict(arg_type="list", required=False, aliases=["volumes"])
-    )
     try:
-        BetterArgParser(arg_def).parse_args(module.params)
+        BetterArgParser(_to_arg_def(_ARGUMENT_SPEC)).parse_args(module.params)
     except ValueError as err:
         module.fail_json(
             msg="Parameter verification failed", stderr=str(err)
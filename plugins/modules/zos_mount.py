@@ -157,6 +157,7 @@ options:
                     - Comments are used to encapsulate the I(persistent/data_store) entry
                       such that they can easily be understood and located.
                 type: list
+                elements: str
                 required: False
     unmount_opts:
         description:
@@ -528,8 +529,9 @@ rc:
 import os
 import re
 import tempfile
+import time
 
-from datetime import datetime
+from textwrap import wrap
 from ansible.module_utils.basic import AnsibleModule
 
 
@@ -568,11 +570,72 @@ except Exception:
 # supported data set types
 mt_DS_TYPE = ["PS", "PO"]
 
+# (exists, ds_type) of each data set looked up by mt_ds_info
+MT_DS_INFO = dict()
+
+# Matches an empty record, or one starting with a null, in a parmlib member
+EMPTY_RECORD_REGEX = re.compile(r"^(?:\x00[^\n]*)?\n", re.MULTILINE)
+
+# Matches trailing blanks at the end of each record
+TRAILING_BLANKS_REGEX = re.compile(r"[ \t]+$", re.MULTILINE)
+
+# Matches the BEGIN and END markers of a block written by this module,
+# capturing all but the timestamp
+MANAGED_BLOCK_REGEX = re.compile(
+    r"^(/\* (?:BEGIN|END) ANSIBLE MANAGED BLOCK) \S+ \*/$", re.MULTILINE
+)
+
+# Matches a parenthesized file system name in the output of df
+DF_FILESYSTEM_REGEX = re.compile(r"\(([^()\s]+)\)")
+
+# Operands of a MOUNT statement that may start one of its continuation
+# lines in a parmlib member
+MOUNT_OPERANDS = (
+    "MOUNTPOINT", "TYPE", "MODE", "PARM", "TAG", "SETUID", "NOSETUID",
+    "WAIT", "NOWAIT", "SECURITY", "NOSECURITY", "SYSNAME",
+    "AUTOMOVE", "NOAUTOMOVE", "UNMOUNT", "DDNAME",
+)
+
+# Statements of a BPXPRMxx member. An indented line that starts with one
+# of them begins a new statement rather than continuing the one above it
+PARMLIB_STATEMENTS = (
+    "MOUNT", "ROOT", "FILESYSTYPE", "SUBFILESYSTYPE", "NETWORK", "VERSION",
+    "SYSPLEX", "ALTROOT", "AUTOCVT", "AUTHPGMLIST", "CTRACE", "FORKCOPY",
+    "LIMMSG", "NONEMPTYMOUNTPT", "STARTUP_PROC", "STARTUP_EXEC",
+    "RESOLVER_PROC", "STEPLIBLIST", "SUPERUSER", "SWA", "TTYGROUP", "UMASK",
+    "USERIDALIASTABLE", "SYSHFSLIMIT", "MAXPROCSYS", "MAXPROCUSER",
+    "MAXUIDS", "MAXFILEPROC", "MAXFILESIZE", "MAXTHREADS", "MAXTHREADTASKS",
+    "MAXPTYS", "MAXRTYS", "MAXCORESIZE", "MAXASSIZE", "MAXCPUTIME",
+    "MAXMMAPAREA", "MAXSHAREPAGES", "MAXIOBUFUSER", "MAXQUEUEDSIGS",
+    "IPCMSGNIDS", "IPCMSGQBYTES", "IPCMSGQMNUM", "IPCSEMNIDS", "IPCSEMNOPS",
+    "IPCSEMNSEMS", "IPCSHMNIDS", "IPCSHMNSEGS", "IPCSHMSPAGES",
+    "IPCSHMMPAGES", "SHRLIBRGNSIZE", "SHRLIBMAXPAGES", "PRIORITYPG",
+    "PRIORITYGOAL", "SC_EXITTABLE", "KERNELSTACKS", "SYSCALL_COUNTS",
+)
+
+# The rest of a statement line. Comments, quoted strings and parenthesized
+# values are matched whole, so that one left open continues the line onto
+# the following lines until it is closed
+STATEMENT_TEXT = (
+    r"(?:/\*(?:[^*]|\*(?!/))*\*/|'[^']*'|\((?:[^'()]|'[^']*')*\)"
+    r"|[^'()\n]|[()'])*(?:\n|\Z)"
+)
+
+
+def mt_ds_info(name):
+    """
+    mt_ds_info returns (exists, ds_type) for the data set name, so that the
+    catalog is only queried once per data set during a module run
+    """
+    if name not in MT_DS_INFO:
+        ds_utils = data_set.DataSetUtils(name)
+        MT_DS_INFO[name] = (ds_utils.exists(), ds_utils.ds_type())
+    return MT_DS_INFO[name]
+
 
 def mt_backupOper(module, src, backup):
     # analysis the file type
-    ds_utils = data_set.DataSetUtils(src)
-    file_type = ds_utils.ds_type()
+    file_type = mt_ds_info(src)[1]
     if file_type != "USS" and file_type not in mt_DS_TYPE:
         message = "{0} data set type is NOT supported".format(str(file_type))
         module.fail_json(msg=message)
@@ -595,67 +658,87 @@ def mt_backupOper(module, src, backup):
     return backup_name
 
 
-def swap_text(original, adding, removing):
+def get_mounted_file_systems(module, path=None):
     """
-    swap_text returns original after removing blocks matching removing,
-    and adding the adding param
-    original now should be a list of lines without newlines
-    return is the consolidated file value
+    get_mounted_file_systems returns the names of the mounted file systems
+    reported by df, either for the file system holding path or, when path
+    is not given, for every mounted file system.
+    Returns None if df fails.
     """
-    content_lines = original
-
-    remove_starting_at_index = None
-    remove_ending_at_index = None
-
-    ms = re.compile(r"^\s*MOUNT\s+FILESYSTEM\(\s*'" + removing.upper() + r"'\s*\)")
-    removable = dict()
-
-    for index, line in enumerate(content_lines):
-        if remove_starting_at_index is None:
-            if ms.match(line) is not None:
-                remove_starting_at_index = index
-                # Check for comments above the match line
-                if index > 0:
-                    for tmpindex in range(index - 1, 0, -1):
-                        tmpline = content_lines[tmpindex]
-                        if len(tmpline) > 0:
-                            # Added the second test to handle adjacent entries
-                            if tmpline[0:2] != "/*" or tmpline[0:6] == "/* BEG":
-                                remove_starting_at_index = tmpindex
-                                break
-                        else:
-                            remove_starting_at_index = tmpindex
-                            break
-                remove_ending_at_index = index
-                continue
-        if remove_starting_at_index is not None:
-            remove_ending_at_index = index
-            doit = False
-            if len(line) > 0:
-                if line[0] != " " and line[0] != "\t" and line[0:2] != "/*":
-                    doit = True
-                elif line[0:6] == "/* END":
-                    doit = True
-            else:
-                doit = True
-            if doit:
-                removable[remove_starting_at_index] = remove_ending_at_index
-                remove_starting_at_index = None
-                remove_ending_at_index = None
+    df_cmd = ["df"]
+    if path:
+        df_cmd.append(path)
+    rc, stdout, stderr = module.run_command(df_cmd, use_unsafe_shell=False)
+    if rc != 0:
+        return None
+
+    # df lists each mounted file system name in parentheses, after the
+    # mount point. Matching the whole name avoids false positives when
+    # one data set name is a prefix of another. The pattern cannot span
+    # lines, so the output past the header is scanned in a single call.
+    return set(DF_FILESYSTEM_REGEX.findall(stdout.partition("\n")[2]))
 
-    if remove_starting_at_index is not None:
-        if remove_ending_at_index is not None:
-            if remove_starting_at_index != remove_ending_at_index:
-                removable[remove_starting_at_index] = remove_ending_at_index
 
-    for startidx in reversed(removable.keys()):
-        endidx = removable[startidx]
-        del content_lines[startidx: endidx + 1]
+def mount_block_regex(name):
+    """
+    mount_block_regex returns a pattern matching each MOUNT statement for
+    the file system name, in any case, along with its continuation lines:
+    lines that start with a MOUNT operand, indented lines that do not
+    start another statement, and lines inside a quoted string or a
+    parenthesized value left open above them. When the statement is in a
+    managed block, the match also covers the BEGIN marker, the comment
+    lines of the block and the END marker. Comment lines outside a managed
+    block are never matched.
+    """
+    return re.compile(
+        r"^(/\* BEGIN ANSIBLE MANAGED BLOCK [^\n]*\n(?:/\*(?! BEGIN | END )[^\n]*\n)*)?"
+        r"[ \t]*MOUNT[ \t]+FILESYSTEM\([ \t]*'" + re.escape(name) + r"'[ \t]*\)" + STATEMENT_TEXT
+        + r"(?:[ \t]*(?:" + "|".join(MOUNT_OPERANDS) + r")\b" + STATEMENT_TEXT
+        + r"|[ \t]+(?![ \t]|/\*|(?:" + "|".join(PARMLIB_STATEMENTS) + r")\b)" + STATEMENT_TEXT
+        + r"|(?(1)/\*(?! BEGIN | END )[^\n]*(?:\n|\Z)|(?!)))*"
+        r"(?(1)(?:/\* END ANSIBLE MANAGED BLOCK [^\n]*(?:\n|\Z))?)",
+        re.IGNORECASE | re.MULTILINE,
+    )
+
+
+def same_managed_text(original, updated):
+    """
+    same_managed_text returns True when updated differs from original only
+    in trailing blanks or in the timestamps of the managed block markers,
+    so that rewriting the persistent data set would not change its content
+    """
+    def comparable(text):
+        text = TRAILING_BLANKS_REGEX.sub("", text)
+        return MANAGED_BLOCK_REGEX.sub(r"\1", text).rstrip("\n")
 
+    return comparable(original) == comparable(updated)
+
+
+def swap_text(original, adding, removing):
+    """
+    swap_text returns original with the first block matching removing
+    replaced by the adding param, and any other matching block removed.
+    When no block matches, adding is appended to the end instead.
+    original should be the text of the member, without empty records
+    return is the consolidated text of the member
+    """
+    pattern = mount_block_regex(removing)
+    match = pattern.search(original)
+
+    if match is not None:
+        return (
+            original[: match.start()]
+            + adding
+            + pattern.sub("", original[match.end() :])
+        )
+
+    content = original
     if len(adding) > 0:
-        content_lines.extend(adding.split("\n"))
+        if len(content) > 0 and not content.endswith("\n"):
+            content += "\n"
+        content += adding
 
-    return "\n".join(content_lines)
+    return content
 
 
 # #############################################################################
@@ -664,6 +747,10 @@ def swap_text(original, adding, removing):
 
 
 def run_module(module, arg_def):
+    check_mode = module.check_mode
+    run_command = module.run_command
+    fail_json = module.fail_json
+
     # ********************************************************************
     # Verify the validity of module args. BetterArgParser raises ValueError
     # when a parameter fails its validation check
@@ -673,7 +760,7 @@ def run_module(module, arg_def):
         parser = better_arg_parser.BetterArgParser(arg_def)
         parsed_args = parser.parse_args(module.params)
     except ValueError as err:
-        module.fail_json(msg="Parameter verification failed", stderr=str(err))
+        fail_json(msg="Parameter verification failed", stderr=str(err))
     changed = False
     res_args = dict()
 
@@ -695,11 +782,19 @@ def run_module(module, arg_def):
     automove = parsed_args.get("automove")
     automove_list = parsed_args.get("automove_list")
 
+    # Exact membership tests, since a substring test such as
+    # "mounted" in state also matches unmounted and remounted
+    will_mount = state in {"mounted", "present", "remounted"}
+    will_unmount = state in {"unmounted", "remounted", "absent"}
+    updates_persistent = state in {"mounted", "present", "absent"}
+
     if persistent:
         data_store = persistent.get("data_store").upper()
         comment = persistent.get("comment")
         backup = persistent.get("backup")
-        if backup:
+        # unmounted and remounted leave the data store as it is, so there
+        # is nothing to back up for them
+        if backup and updates_persistent:
             if persistent.get("backup_name"):
                 backup_name = persistent.get("backup_name").upper()
             if len(backup_name) < 1:
@@ -708,213 +803,163 @@ def run_module(module, arg_def):
                 backup_code = backup_name
             backup_name = mt_backupOper(module, data_store, backup_code)
             res_args["backup_name"] = backup_name
-            del persistent["backup"]
-        if "mounted" in state or "present" in state:
-            persistent["addDataset"] = data_store
-        else:
-            persistent["delDataset"] = data_store
-        del persistent["data_store"]
+        # The persistent options are reported back in their final shape,
+        # with data_store renamed to delDataset for absent and to
+        # addDataset for every other state
+        ds_key = "delDataset" if state == "absent" else "addDataset"
+        persistent = {
+            ds_key: data_store,
+            "backup_name": persistent.get("backup_name"),
+            "comment": comment,
+        }
+        if not backup:
+            persistent["backup"] = backup
+        parsed_args["persistent"] = persistent
 
     write_persistent = False
-    if "mounted" in state or "present" in state or "absent" in state:
+    if updates_persistent:
         if persistent:
             if data_store:
                 if len(data_store) > 0:
                     write_persistent = True
 
-    will_mount = True
-    if "unmounted" in state or "absent" in state:
-        will_mount = False
-
-    will_unmount = False
-    if "unmounted" in state or "remounted" in state or "absent" in state:
-        will_unmount = True
-
+    # The parsed arguments are returned as given, except for fs_type
+    res_args.update(parsed_args)
     res_args.update(
-        dict(
-            src=src,
-            path=path,
-            fs_type=fs_type,
-            state=state,
-            persistent=parsed_args.get("persistent"),
-            unmount_opts=unmount_opts,
-            mount_opts=mount_opts,
-            src_params=src_params,
-            tag_untagged=tag_untagged,
-            tag_ccsid=tag_ccsid,
-            allow_uid=allow_uid,
-            sysname=sysname,
-            automove=automove,
-            automove_list=automove_list,
-            cmd="not built",
-            changed=changed,
-            comment=comment,
-            rc=0,
-            stdout="",
-            stderr="",
-        )
+        fs_type=fs_type,
+        cmd="not built",
+        changed=changed,
+        comment=comment,
+        rc=0,
+        stdout="",
+        stderr="",
     )
 
     # data set to be mounted/unmounted must exist
-    fs_du = data_set.DataSetUtils(src)
-    fs_exists = fs_du.exists()
+    fs_exists = mt_ds_info(src)[0]
     if fs_exists is False:
-        module.fail_json(
+        fail_json(
             msg="Mount source (" + src + ") either is not cataloged or does not exist.", stderr=str(res_args)
         )
 
     # Validate mountpoint exists if mounting
+    path_created = will_mount and not os.path.isdir(path)
     if will_mount:
-        mp_exists = os.path.exists(path)
-        if mp_exists is False:
-            try:
-                os.mkdir(path)
-            except Exception as err:
-                msg = "Exception encountered during directory creation: {0}".format(str(err))
-                module.fail_json(msg=msg, stderr=str(res_args))
-
-        currently_mounted = False
-        mp_exists = os.path.exists(path)
-        if mp_exists is False:
-            module.fail_json(
-                msg="Mount destination (" + path + ") doesn't exist",
-                stderr=str(res_args),
-            )
-
-    # Need to see if mountpoint is in use for idempotence
-    currently_mounted = False
-
-    rc, stdout, stderr = module.run_command("df", use_unsafe_shell=False)
-
-    if rc != 0:
-        module.fail_json(
-            msg="Checking filesystem list failed with error", stderr=str(res_args)
-        )
-    sttest = stdout.splitlines()
-    for line in sttest:
-        if src in line:
-            currently_mounted = True
-            # reminder: we can space-split the string and find out mount destination
-            break
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as err:
+            msg = "Exception encountered during directory creation: {0}".format(str(err))
+            fail_json(msg=msg, stderr=str(res_args))
+
+    # Need to see if mountpoint is in use for idempotence. The mount status
+    # is only consulted when mounting or unmounting, so df is skipped
+    # otherwise.
+    currently_mounted = None
+
+    if will_mount or will_unmount:
+        # Ask df about the mount point alone first, which covers the usual
+        # case of src already being mounted on path. src may still be mounted
+        # elsewhere, so fall back to the full list when it is not found.
+        # Nothing can be mounted on a directory that was just created.
+        mounted = None
+        if not path_created and os.path.exists(path):
+            mounted = get_mounted_file_systems(module, path)
+        if mounted is None or src.upper() not in mounted:
+            mounted = get_mounted_file_systems(module)
+            if mounted is None:
+                fail_json(
+                    msg="Checking filesystem list failed with error", stderr=str(res_args)
+                )
+        currently_mounted = src.upper() in mounted
 
     # can type be validated?
 
     # ##########################################
     # Assemble the mount command
 
-    d = datetime.today()
-    dtstr = d.strftime("%Y%m%d-%H%M%S")
-    parmtext = "/* BEGIN ANSIBLE MANAGED BLOCK " + dtstr + " */\n"
-    parmtail = "\n" + parmtext.replace("BEGIN", "END")
-
-    if comment is not None:
-        extra = ""
-        ctr = 1
-        for tabline in comment:
-            if len(extra) > 0:
-                extra += " "
-            extra += tabline.strip()
-            if len(extra) > 60:
-                stopper = 60
-                for i in range(59, 48, -1):
-                    if extra[i] == " ":
-                        stopper = i
-                        break
-                tmpx = extra[0:stopper]
-                parmtext += "/* C{0}:{1}".format(ctr, tmpx)
-                extra = extra[stopper:].strip()
-            else:
-                parmtext += "/* C{0}:{1}".format(ctr, extra)
-                extra = ""
-            parmtext += " */\n"
-            ctr += 1
-        # This is to handle the possibility of cumulative, multi-line overflow
-        while len(extra) > 0:
-            if len(extra) > 60:
-                stopper = 60
-                for i in range(59, 48, -1):
-                    if extra[i] == " ":
-                        stopper = i
-                        break
-                tmpx = extra[0:stopper]
-                parmtext += "/* C{0}:{1}".format(ctr, tmpx)
-                extra = extra[stopper:].strip()
-            else:
-                parmtext += "/* C{0}:{1}".format(ctr, extra)
-                extra = ""
-            parmtext += " */\n"
-            ctr += 1
-
     fullcmd = ""
     fullumcmd = ""
     stderr = ""
 
+    # Nothing is assembled unless mounting. The absent state only removes
+    # the entry from the persistent data set, so its parmtext stays empty.
     if will_mount:
-        fullcmd = "MOUNT FILESYSTEM\\( \\'{0}\\' \\) MOUNTPOINT\\( \\'{1}\\' \\) TYPE\\( '{2}' \\)".format(
-            src, path, fs_type
-        )
-        parmtext = (
-            parmtext
-            + "MOUNT FILESYSTEM('{0}')\n      MOUNTPOINT('{1}')\n      TYPE('{2}')".format(
-                src, path, fs_type
+        # The parmlib entry is collected as a list of parts and joined once.
+        # Each operand of the MOUNT statement goes on its own indented line.
+        dtstr = time.strftime("%Y%m%d-%H%M%S")
+        parm_parts = ["/* BEGIN ANSIBLE MANAGED BLOCK {0} */\n".format(dtstr)]
+
+        if comment is not None:
+            # Comment lines are joined and re-wrapped at 60 characters, so that
+            # each parmlib comment line fits within the record length.
+            extra = " ".join([tabline.strip() for tabline in comment if tabline])
+            parm_parts.extend(
+                [
+                    "/* C{0}:{1} */\n".format(ctr, tmpx)
+                    for ctr, tmpx in enumerate(wrap(extra, 60, break_on_hyphens=False), 1)
+                ]
             )
-        )
-        if "RO" in mount_opts:
+
+        # mount_opts is tokenized once, in upper case, and each option is
+        # an exact token match rather than a substring scan
+        mount_flags = set((mount_opts or "").upper().split(","))
+        if "RO" in mount_flags:
             subcmd = "READ"
         else:
             subcmd = "RDWR"
-        fullcmd = "{0} MODE\\({1}\\)".format(fullcmd, subcmd)
-        parmtext = "{0}\n      MODE({1})".format(parmtext, subcmd)
+        # Operands are collected for both the tsocmd command, which needs
+        # its parentheses and quotes escaped, and the parmlib statement
+        cmd_parts = [
+            "MOUNT FILESYSTEM\\( \\'{0}\\' \\)".format(src),
+            "MOUNTPOINT\\( \\'{0}\\' \\)".format(path),
+            "TYPE\\( '{0}' \\)".format(fs_type),
+            "MODE\\({0}\\)".format(subcmd),
+        ]
+        parm_opts = [
+            "MOUNT FILESYSTEM('{0}')".format(src),
+            "MOUNTPOINT('{0}')".format(path),
+            "TYPE('{0}')".format(fs_type),
+            "MODE({0})".format(subcmd),
+        ]
 
         if src_params is not None:
             if len(src_params) > 1:
-                fullcmd = "{0} PARM\\(\\'{1}\\'\\)".format(fullcmd, src_params)
-                parmtext = "{0}\n      PARM('{1}')".format(parmtext, src_params)
+                cmd_parts.append("PARM\\(\\'{0}\\'\\)".format(src_params))
+                parm_opts.append("PARM('{0}')".format(src_params))
 
         if tag_untagged is not None:
             if len(tag_untagged) > 0:
-                fullcmd = "{0} TAG\\({1},{2}\\)".format(
-                    fullcmd, tag_untagged, tag_ccsid
-                )
-                parmtext = "{0}\n      TAG({1},{2})".format(
-                    parmtext, tag_untagged, tag_ccsid
-                )
-
-        if allow_uid:
-            fullcmd = fullcmd + " SETUID"
-            parmtext = parmtext + "\n      SETUID"
-        else:
-            fullcmd = fullcmd + " NOSETUID"
-            parmtext = parmtext + "\n      NOSETUID"
-
-        if "NOWAIT" in mount_opts:
-            fullcmd = fullcmd + " NOWAIT"
-            parmtext = parmtext + "\n      NOWAIT"
-        else:
-            fullcmd = fullcmd + " WAIT"
-            parmtext = parmtext + "\n      WAIT"
-
-        if "NOSECURITY" in mount_opts:
-            fullcmd = fullcmd + " NOSECURITY"
-            parmtext = parmtext + "\n      NOSECURITY"
-        else:
-            fullcmd = fullcmd + " SECURITY"
-            parmtext = parmtext + "\n      SECURITY"
+                cmd_parts.append("TAG\\({0},{1}\\)".format(tag_untagged, tag_ccsid))
+                parm_opts.append("TAG({0},{1})".format(tag_untagged, tag_ccsid))
+
+        # Each of these keywords is always given, in one of its two forms
+        for enabled, if_true, if_false in (
+            (allow_uid, "SETUID", "NOSETUID"),
+            ("NOWAIT" in mount_flags, "NOWAIT", "WAIT"),
+            ("NOSECURITY" in mount_flags, "NOSECURITY", "SECURITY"),
+        ):
+            keyword = if_true if enabled else if_false
+            cmd_parts.append(keyword)
+            parm_opts.append(keyword)
 
         if sysname is not None:
             if len(sysname) > 0 and len(sysname) < 9:
-                fullcmd = "{0} SYSNAME\\({1}\\)".format(fullcmd, sysname)
-                parmtext = "{0}\n      SYSNAME({1})".format(parmtext, sysname)
+                cmd_parts.append("SYSNAME\\({0}\\)".format(sysname))
+                parm_opts.append("SYSNAME({0})".format(sysname))
 
         if automove is not None:
             if len(automove) > 1:
-                fullcmd = fullcmd + " " + automove
-                parmtext = parmtext + "\n      " + automove
+                automove_opt = automove
                 if automove_list is not None:
                     if len(automove_list) > 1:
-                        fullcmd = fullcmd + "(" + automove_list + ")"
-                        parmtext = parmtext + "(" + automove_list + ")"
-        parmtext = parmtext + parmtail
+                        automove_opt = automove_opt + "(" + automove_list + ")"
+                cmd_parts.append(automove_opt)
+                parm_opts.append(automove_opt)
+
+        fullcmd = " ".join(cmd_parts)
+        parm_parts.append("\n      ".join(parm_opts))
+        parm_parts.append("\n/* END ANSIBLE MANAGED BLOCK {0} */\n".format(dtstr))
+        parmtext = "".join(parm_parts)
     else:
         parmtext = ""
 
@@ -922,102 +967,91 @@ def run_module(module, arg_def):
     stdout = stderr = None
 
     if will_unmount:  # unmount/remount
-        fullumcmd = "UNMOUNT FILESYSTEM\\( '{0}' \\)".format(src)
-        if unmount_opts is None:
-            unmount_opts = "NORMAL"
-            fullumcmd = fullcmd + " " + unmount_opts
-        elif len(unmount_opts) < 2:
+        if unmount_opts is None or len(unmount_opts) < 2:
             unmount_opts = "NORMAL"
-            fullumcmd = fullcmd + " " + unmount_opts
+        fullumcmd = "UNMOUNT FILESYSTEM\\( '{0}' \\) {1}".format(src, unmount_opts)
 
     if will_unmount:
         if currently_mounted:
             changed = True
-            if module.check_mode is False:
+            if check_mode is False:
                 try:
                     # Pulled out because it returned errors w/o/r2 auth
                     # (rc, stdout, stderr) = mvs_cmd.ikjeft01(
                     #    fullumcmd, authorized=True
                     # )
                     fullumcmd = "tsocmd " + fullumcmd
-                    (rc, stdout, stderr) = module.run_command(
+                    (rc, stdout, stderr) = run_command(
                         fullumcmd, use_unsafe_shell=False
                     )
                     currently_mounted = False
                 except Exception as err:
                     msg = "Exception encountered when running unmount: {0}".format(str(err))
-                    module.fail_json(msg=msg, stderr=str(stderr) + str(res_args))
+                    fail_json(msg=msg, stderr=str(stderr) + str(res_args))
             else:
                 stdout = "ANSIBLE CHECK MODE"
 
     if will_mount:
         if currently_mounted is False:
             changed = True
-            if module.check_mode is False:
+            if check_mode is False:
                 try:
                     # (rc, stdout, stderr) = mvs_cmd.ikjeft01(
                     #    fullcmd, authorized=True
                     # )
                     fullcmd = "tsocmd " + fullcmd
-                    (rc, stdout, stderr) = module.run_command(
+                    (rc, stdout, stderr) = run_command(
                         fullcmd, use_unsafe_shell=False
                     )
                 except Exception as err:
                     msg = "Exception occurrend when running mount: {0}".format(str(err))
-                    module.fail_json(msg=msg, stderr=str(res_args))
+                    fail_json(msg=msg, stderr=str(res_args))
             else:
                 stdout = "ANSIBLE CHECK MODE"
         else:
             stderr = "Mount called on data set that is already mounted.\n"
 
-    if write_persistent and module.check_mode is False:
-        fst_du = data_set.DataSetUtils(data_store)
-        fst_exists = fst_du.exists()
+    if write_persistent and check_mode is False:
+        fst_exists = mt_ds_info(data_store)[0]
         if fst_exists is False:
-            module.fail_json(
+            fail_json(
                 msg="Persistent data set ({0}) is either not cataloged or does not exist.".format(data_store),
                 stderr=str(res_args),
             )
 
-        tmp_file = tempfile.NamedTemporaryFile(delete=True)
-        tmp_file_filename = tmp_file.name
-        tmp_file.close()
-
-        copy_ps2uss(data_store, tmp_file_filename, False)
-
-        module.run_command(
-            "chtag -tc ISO8859-1 " + tmp_file_filename, use_unsafe_shell=False
-        )
-
-        with open(tmp_file_filename, "r") as fh:
-            content = fh.read().splitlines()
-
-        cont = list()
+        fd, tmp_file_filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            copy_ps2uss(data_store, tmp_file_filename, False)
 
-        if stdout is None:
-            stdout = " "
-
-        # removing null entries
-        for line in content:
-            if line is not None:
-                if len(line) > 0:
-                    if (line[0:1] is not None) and (line[0:1] != "\u0000"):
-                        cont.append(line)
-
-        stdout += "\n"
-        newtext = swap_text(cont, parmtext, src)
-        if newtext != cont or cont != content:
-            fh = open(tmp_file_filename, "w")
-            fh.write(newtext)
-            fh.close()
-            # pre-clear to prevent caching behavior on the copy-back
-            module.run_command(
-                "mrm " + data_store, use_unsafe_shell=False
+            run_command(
+                "chtag -tc ISO8859-1 " + tmp_file_filename, use_unsafe_shell=False
             )
-            copy_uss2mvs(tmp_file_filename, data_store, "", True)
 
-        if os.path.isfile(tmp_file_filename):
-            os.unlink(tmp_file_filename)
+            with open(tmp_file_filename, "r") as fh:
+                content = fh.read()
+
+            if stdout is None:
+                stdout = " "
+
+            # removing empty and null entries
+            cont = EMPTY_RECORD_REGEX.sub("", content)
+
+            stdout += "\n"
+            newtext = swap_text(cont, parmtext, src)
+            # The data set is only copied back when the entry actually changed,
+            # and not just the timestamp of its managed block
+            if not same_managed_text(cont, newtext):
+                with open(tmp_file_filename, "w") as fh:
+                    fh.write(newtext)
+                # pre-clear to prevent caching behavior on the copy-back
+                run_command(
+                    "mrm " + data_store, use_unsafe_shell=False
+                )
+                copy_uss2mvs(tmp_file_filename, data_store, "", True)
+        finally:
+            if os.path.isfile(tmp_file_filename):
+                os.remove(tmp_file_filename)
 
     if rc == 0:
         if stdout is None:
@@ -1028,19 +1062,135 @@ def run_module(module, arg_def):
             stderr = ""
 
     res_args.update(
-        dict(
-            changed=changed,
-            cmd=fullcmd,
-            rc=rc,
-            stdout=stdout,
-            stderr=stderr,
-        )
+        changed=changed,
+        cmd=fullcmd,
+        rc=rc,
+        stdout=stdout,
+        stderr=stderr,
     )
     del res_args["comment"]
 
     return res_args
 
 
+_ARGUMENT_SPEC = dict(
+    src=dict(type="str", required=True),
+    path=dict(type="str", required=True),
+    fs_type=dict(
+        type="str",
+        choices=[
+            "HFS",
+            "ZFS",
+            "NFS",
+            "TFS",
+        ],
+        required=True,
+    ),
+    state=dict(
+        type="str",
+        default="mounted",
+        choices=["absent", "mounted", "unmounted", "present", "remounted"],
+        required=False,
+    ),
+    persistent=dict(
+        type="dict",
+        required=False,
+        options=dict(
+            data_store=dict(
+                type="str",
+                required=True,
+            ),
+            backup=dict(type="bool", default=False),
+            backup_name=dict(type="str", required=False, default=None),
+            comment=dict(type="list", elements="str", required=False),
+        ),
+    ),
+    unmount_opts=dict(
+        type="str",
+        default="NORMAL",
+        choices=["DRAIN", "FORCE", "IMMEDIATE", "NORMAL", "REMOUNT", "RESET"],
+        required=False,
+    ),
+    mount_opts=dict(
+        type="str",
+        default="RW",
+        choices=["RO", "RW", "SAME", "NOWAIT", "NOSECURITY"],
+        required=False,
+    ),
+    src_params=dict(type="str", required=False),
+    tag_untagged=dict(
+        type="str", default="", choices=["", "TEXT", "NOTEXT"], required=False
+    ),
+    tag_ccsid=dict(type="int", required=False),
+    allow_uid=dict(type="bool", default=True, required=False),
+    sysname=dict(type="str", required=False),
+    automove=dict(
+        type="str",
+        default="AUTOMOVE",
+        choices=["AUTOMOVE", "NOAUTOMOVE", "UNMOUNT"],
+        required=False,
+    ),
+    automove_list=dict(type="str", required=False),
+)
+
+_ARG_DEF = dict(
+    src=dict(arg_type="data_set", required=True),
+    path=dict(arg_type="path", required=True),
+    fs_type=dict(
+        arg_type="str",
+        choices=[
+            "HFS",
+            "ZFS",
+            "NFS",
+            "TFS",
+        ],
+        required=True,
+    ),
+    state=dict(
+        arg_type="str",
+        default="mounted",
+        choices=["absent", "mounted", "unmounted", "present", "remounted"],
+        required=False,
+    ),
+    persistent=dict(
+        arg_type="dict",
+        required=False,
+        options=dict(
+            data_store=dict(arg_type="str", required=True),
+            backup=dict(arg_type="bool", default=False),
+            backup_name=dict(arg_type="str", required=False, default=None),
+            comment=dict(arg_type="list", elements="str", required=False),
+        ),
+    ),
+    unmount_opts=dict(
+        arg_type="str",
+        default="NORMAL",
+        choices=["DRAIN", "FORCE", "IMMEDIATE", "NORMAL", "REMOUNT", "RESET"],
+        required=False,
+    ),
+    mount_opts=dict(
+        arg_type="str",
+        default="RW",
+        choices=["RO", "RW", "SAME", "NOWAIT", "NOSECURITY"],
+        required=False,
+    ),
+    src_params=dict(arg_type="str", default="", required=False),
+    tag_untagged=dict(
+        arg_type="str", default="", choices=["", "TEXT", "NOTEXT"], required=False
+    ),
+    tag_ccsid=dict(arg_type="str", required=False),
+    allow_uid=dict(arg_type="bool", default=True, required=False),
+    sysname=dict(arg_type="str", default="", required=False),
+    automove=dict(
+        arg_type="str",
+        default="AUTOMOVE",
+        choices=["AUTOMOVE", "NOAUTOMOVE", "UNMOUNT"],
+        required=False,
+    ),
+    automove_list=dict(arg_type="str", default="", required=False),
+)
+
+
 # #############################################################################
 # ####################### Main                     ############################
 # #############################################################################
@@ -1050,128 +1200,13 @@ def main():
     global module
 
     module = AnsibleModule(
-        argument_spec=dict(
-            src=dict(type="str", required=True),
-            path=dict(type="str", required=True),
-            fs_type=dict(
-                type="str",
-                choices=[
-                    "HFS",
-                    "ZFS",
-                    "NFS",
-                    "TFS",
-                ],
-                required=True,
-            ),
-            state=dict(
-                type="str",
-                default="mounted",
-                choices=["absent", "mounted", "unmounted", "present", "remounted"],
-                required=False,
-            ),
-            persistent=dict(
-                type="dict",
-                required=False,
-                options=dict(
-                    data_store=dict(
-                        type="str",
-                        required=True,
-                    ),
-                    backup=dict(type="bool", default=False),
-                    backup_name=dict(type="str", required=False, default=None),
-                    comment=dict(type="list", required=False),
-                ),
-            ),
-            unmount_opts=dict(
-                type="str",
-                default="NORMAL",
-                choices=["DRAIN", "FORCE", "IMMEDIATE", "NORMAL", "REMOUNT", "RESET"],
-                required=False,
-            ),
-            mount_opts=dict(
-                type="str",
-                default="RW",
-                choices=["RO", "RW", "SAME", "NOWAIT", "NOSECURITY"],
-                required=False,
-            ),
-            src_params=dict(type="str", required=False),
-            tag_untagged=dict(
-                type="str", default="", choices=["", "TEXT", "NOTEXT"], required=False
-            ),
-            tag_ccsid=dict(type="int", required=False),
-            allow_uid=dict(type="bool", default=True, required=False),
-            sysname=dict(type="str", required=False),
-            automove=dict(
-                type="str",
-                default="AUTOMOVE",
-                choices=["AUTOMOVE", "NOAUTOMOVE", "UNMOUNT"],
-                required=False,
-            ),
-            automove_list=dict(type="str", required=False),
-        ),
+        argument_spec=_ARGUMENT_SPEC,
         add_file_common_args=True,
         supports_check_mode=True,
     )
 
-    arg_def = dict(
-        src=dict(arg_type="data_set", required=True),
-        path=dict(arg_type="path", required=True),
-        fs_type=dict(
-            arg_type="str",
-            choices=[
-                "HFS",
-                "ZFS",
-                "NFS",
-                "TFS",
-            ],
-            required=True,
-        ),
-        state=dict(
-            arg_type="str",
-            default="mounted",
-            choices=["absent", "mounted", "unmounted", "present", "remounted"],
-            required=False,
-        ),
-        persistent=dict(
-            arg_type="dict",
-            required=False,
-            options=dict(
-                data_store=dict(arg_type="str", required=True),
-                backup=dict(arg_type="bool", default=False),
-                backup_name=dict(arg_type="str", required=False, default=None),
-                comment=dict(arg_type="list", elements="str", required=False),
-            ),
-        ),
-        unmount_opts=dict(
-            arg_type="str",
-            default="NORMAL",
-            choices=["DRAIN", "FORCE", "IMMEDIATE", "NORMAL", "REMOUNT", "RESET"],
-            required=False,
-        ),
-        mount_opts=dict(
-            arg_type="str",
-            default="RW",
-            choices=["RO", "RW", "SAME", "NOWAIT", "NOSECURITY"],
-            required=False,
-        ),
-        src_params=dict(arg_type="str", default="", required=False),
-        tag_untagged=dict(
-            arg_type="str", default="", choices=["", "TEXT", "NOTEXT"], required=False
-        ),
-        tag_ccsid=dict(arg_type="str", required=False),
-        allow_uid=dict(arg_type="bool", default=True, required=False),
-        sysname=dict(arg_type="str", default="", required=False),
-        automove=dict(
-            arg_type="str",
-            default="AUTOMOVE",
-            choices=["AUTOMOVE", "NOAUTOMOVE", "UNMOUNT"],
-            required=False,
-        ),
-        automove_list=dict(arg_type="str", default="", required=False),
-    )
-
     res_args = None
-    res_args = run_module(module, arg_def)
+    res_args = run_module(module, _ARG_DEF)
     module.exit_json(**res_args)
 
 
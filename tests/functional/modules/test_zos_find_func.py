@@ -312,3 +312,33 @@ def test_find_non_existent_data_set_members(ansible_zos_module):
     for val in find_res.contacted.values():
         assert len(val.get('data_sets')) == 0
         assert val.get('matched') == 0
+
+
+def test_find_data_sets_with_max_matches(ansible_zos_module):
+    hosts = ansible_zos_module
+    try:
+        hosts.all.zos_data_set(
+            batch=[dict(name=i, type='seq', state='present') for i in SEQ_NAMES]
+        )
+        find_res = hosts.all.zos_find(
+            patterns=['TEST.FIND.SEQ.*.*'],
+            max_matches=2
+        )
+        print(vars(find_res))
+        for val in find_res.contacted.values():
+            assert val.get('msg') is None
+            assert len(val.get('data_sets')) == 2
+            for ds in val.get('data_sets'):
+                assert ds.get('name') in SEQ_NAMES
+            assert val.get('matched') == 2
+    finally:
+        hosts.all.zos_data_set(
+            batch=[dict(name=i, state='absent') for i in SEQ_NAMES]
+        )
+
+
+def test_find_invalid_max_matches_fails(ansible_zos_module):
+    hosts = ansible_zos_module
+    find_res = hosts.all.zos_find(patterns=['some.pattern'], max_matches=0)
+    for val in find_res.contacted.values():
+        assert val.get('msg') is not None
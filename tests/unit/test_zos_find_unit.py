@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2021
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+import pytest
+
+IMPORT_NAME = "ibm_zos_core.plugins.modules.zos_find"
+
+NAMES = [
+    "IMSTESTL.IMS01.DDCHKPT",
+    "imstestl.ims01.spool1",
+    "IMSTESTL.COMNUC",
+    "IMSTESTM.IMS02.RESTART",
+    "USER.PRIVATE.PROCLIB",
+    "USER.TEST",
+    "A",
+    "AB",
+    "ABBB",
+    "AC",
+    "XYZ.DATA",
+]
+
+
+class DummyFailure(Exception):
+    pass
+
+
+class DummyModule(object):
+    """Used in place of Ansible's module
+    so we can easily mock the desired behavior."""
+
+    def fail_json(self, *args, **kwargs):
+        raise DummyFailure(kwargs.get("msg"))
+
+
+@pytest.fixture(scope="function")
+def zos_find_mocker(zos_import_mocker):
+    """Pytest fixture in charge of patching unavailable imports
+    so we can run z/OS module test cases on x86 for zos_find.
+
+    Args:
+        zos_import_mocker (zos_import_mocker): A pytest fixture
+
+    Yields:
+        object: The zos_find module object
+    """
+    mocker, importer = zos_import_mocker
+    zos_find = importer(IMPORT_NAME)
+    yield zos_find
+
+
+def assert_prefixes_keep_matches(zos_find, patterns):
+    """Asserts that filtering on the literal prefixes of the patterns never
+    drops a name that one of the patterns matches.
+
+    Args:
+        zos_find (zos_find_mocker): Mocker object which provides access to functions in zos_find module.
+        patterns (list[str]): The regular expressions to check.
+    """
+    candidates = zos_find._prefix_candidates(
+        NAMES, zos_find._literal_prefixes(patterns)
+    )
+    for name in NAMES:
+        if any(re.match(pattern, name, re.IGNORECASE) for pattern in patterns):
+            assert name in candidates
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        ("IMSTESTL.*", ("IMSTESTL",)),
+        ("^IMSTESTL.*", ("IMSTESTL",)),
+        ("imstestl.*", ("IMSTESTL",)),
+        ("AB*", ("A",)),
+        ("AB?", ("A",)),
+        ("AB{0}", ("A",)),
+        ("AB{0,3}", ("A",)),
+        ("AB+", ("A",)),
+        ("(?:USER)\\..*", ("USER.",)),
+        ("A[BC]", ("A",)),
+        ("A\\d", ("A",)),
+        ("(?i)user\\.", ("USER.",)),
+        ("(?x) USER \\. TEST", ("USER.TEST",)),
+    ],
+)
+def test_literal_prefixes(zos_find_mocker, pattern, expected):
+    assert zos_find_mocker._literal_prefixes([pattern]) == expected
+    assert_prefixes_keep_matches(zos_find_mocker, [pattern])
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [".*", "[A-Z]+", "(IMSTESTL)\\..*", "IMSTESTL|USER", "ABC|XYZ", "AB|XY.*", "*AB", "AB["],
+)
+def test_literal_prefixes_without_prefix(zos_find_mocker, pattern):
+    assert zos_find_mocker._literal_prefixes([pattern]) is None
+
+
+def test_literal_prefixes_of_several_patterns(zos_find_mocker):
+    patterns = ["IMSTESTL.*", "USER\\..*", "IMSTESTL\\.IMS01.*"]
+    assert sorted(zos_find_mocker._literal_prefixes(patterns)) == [
+        "IMSTESTL",
+        "IMSTESTL.IMS01",
+        "USER.",
+    ]
+    assert_prefixes_keep_matches(zos_find_mocker, patterns)
+    assert zos_find_mocker._literal_prefixes(["IMSTESTL.*", ".*DATA"]) is None
+    assert zos_find_mocker._literal_prefixes([]) is None
+    assert zos_find_mocker._literal_prefixes(None) is None
+
+
+def test_prefix_candidates(zos_find_mocker):
+    assert zos_find_mocker._prefix_candidates(NAMES, ("IMSTESTL",)) == [
+        "IMSTESTL.IMS01.DDCHKPT",
+        "imstestl.ims01.spool1",
+        "IMSTESTL.COMNUC",
+    ]
+    assert zos_find_mocker._prefix_candidates(NAMES, ("USER.", "XYZ")) == [
+        "USER.PRIVATE.PROCLIB",
+        "USER.TEST",
+        "XYZ.DATA",
+    ]
+    assert zos_find_mocker._prefix_candidates(iter(NAMES), None) == NAMES
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        ["IMSTESTL\\..*", "USER\\..*"],
+        ["^A$", "AB*", "XYZ"],
+        ["IMSTESTL|USER\\.TEST", "A.$"],
+    ],
+)
+def test_combine_patterns(zos_find_mocker, patterns):
+    compiled = tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+    combined = zos_find_mocker._combine_patterns(compiled)
+    assert len(combined) == 1
+    for name in NAMES:
+        expected = any(pattern.match(name) for pattern in compiled)
+        assert bool(combined[0].match(name)) == expected
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        ["(IMSTESTL)\\..*", "USER\\..*"],
+        ["(A)\\1", "AB"],
+        ["(?x) USER \\. TEST", "XYZ"],
+        ["IMSTESTL.*"],
+    ],
+)
+def test_combine_patterns_unchanged(zos_find_mocker, patterns):
+    compiled = tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+    assert zos_find_mocker._combine_patterns(compiled) == compiled
+
+
+def test_combine_patterns_with_inline_flags(zos_find_mocker):
+    compiled = tuple(
+        re.compile(pattern, re.IGNORECASE)
+        for pattern in ["(?i)user\\..*", "imstestm.*", "(?s)A.B"]
+    )
+    combined = zos_find_mocker._combine_patterns(compiled)
+    for name in NAMES:
+        expected = any(pattern.match(name) for pattern in compiled)
+        assert any(pattern.match(name) for pattern in combined) == expected
+
+
+def test_compile_patterns(zos_find_mocker):
+    compiled = zos_find_mocker._compile_patterns(
+        DummyModule(), ["imstestl\\..*", "USER\\.TEST"]
+    )
+    assert [name for name in NAMES if any(pat.match(name) for pat in compiled)] == [
+        "IMSTESTL.IMS01.DDCHKPT",
+        "imstestl.ims01.spool1",
+        "IMSTESTL.COMNUC",
+        "USER.TEST",
+    ]
+    assert zos_find_mocker._compile_patterns(DummyModule(), None) == ()
+
+
+@pytest.mark.parametrize("pattern", ["AB[", "*AB", "(IMSTESTL"])
+def test_compile_patterns_invalid(zos_find_mocker, pattern):
+    with pytest.raises(DummyFailure):
+        zos_find_mocker._compile_patterns(DummyModule(), ["USER.*", pattern])
+
+
+class MlsModule(DummyModule):
+    """Answers each 'mls' command with members named after the data set."""
+
+    def __init__(self):
+        self.commands = []
+
+    def get_bin_path(self, arg, required=False):
+        return "/usr/lpp/IBM/zoautil/bin/{0}".format(arg)
+
+    def run_command(self, args, **kwargs):
+        self.commands.append(args)
+        pds = args[1][:-len("(*)")]
+        if pds.startswith("EMPTY"):
+            return 2, "", ""
+        return 0, "{0}1\n{0}2\n".format(pds.split(".")[-1]), ""
+
+
+@pytest.mark.parametrize("count", [1, 3, 40])
+def test_list_pds_members(zos_find_mocker, count):
+    pds_names = ["USER.P{0}".format(index) for index in range(count)] + ["EMPTY.PDS"]
+    module = MlsModule()
+    members = zos_find_mocker._list_pds_members(module, pds_names)
+    assert members[:-1] == [
+        set(["P{0}1".format(index), "P{0}2".format(index)]) for index in range(count)
+    ]
+    assert members[-1] == {}
+    assert module.commands[0] == ["/usr/lpp/IBM/zoautil/bin/mls", "USER.P0(*)"]
+
+
+class FailingMlsModule(MlsModule):
+    """Fails the 'mls' command of the data sets whose name starts with
+    prefix, as run_command does when the command cannot be started."""
+
+    def __init__(self, prefix):
+        super(FailingMlsModule, self).__init__()
+        self.prefix = prefix
+        self.failures = 0
+
+    def run_command(self, args, **kwargs):
+        if args[1].startswith(self.prefix):
+            self.failures += 1
+            self.fail_json(msg="Unable to run 'mls'")
+        return super(FailingMlsModule, self).run_command(args, **kwargs)
+
+
+@pytest.mark.parametrize("count", [1, 3, 40])
+def test_list_pds_members_fails(zos_find_mocker, count):
+    pds_names = ["USER.P{0}".format(index) for index in range(count)] + ["USER.BAD"]
+    with pytest.raises(DummyFailure, match="'mls'"):
+        zos_find_mocker._list_pds_members(FailingMlsModule("USER.BAD"), pds_names)
+
+
+def test_list_pds_members_fails_once(zos_find_mocker):
+    pds_names = ["USER.P{0}".format(index) for index in range(40)]
+    module = FailingMlsModule("USER.")
+    with pytest.raises(DummyFailure, match="'mls'"):
+        zos_find_mocker._list_pds_members(module, pds_names)
+    assert module.failures == 1
+
+
+def test_list_pds_members_without_mls(zos_find_mocker, mocker):
+    module = MlsModule()
+    mocker.patch.object(module, "get_bin_path", side_effect=DummyFailure("mls"))
+    with pytest.raises(DummyFailure, match="mls"):
+        zos_find_mocker._list_pds_members(module, ["USER.P1", "USER.P2"])
+    assert module.commands == []
+
+
+def test_list_pds_members_exits(zos_find_mocker, mocker):
+    module = MlsModule()
+    mocker.patch.object(module, "run_command", side_effect=[(0, "", "")] + [SystemExit(1)] * 2)
+    with pytest.raises(SystemExit):
+        zos_find_mocker._list_pds_members(module, ["USER.P1", "USER.P2", "USER.P3"])
+
+
+class FakeDls(object):
+    """Stands in for the Popen object of a 'dls' process."""
+
+    def __init__(self, lines, rc=0, stderr=b""):
+        self.lines = lines
+        self.rc = rc
+        self.stderr = stderr
+        self.killed = False
+
+    def __call__(self, args, stdout=None, stderr=None):
+        self.args = args
+        stderr.write(self.stderr)
+        self.stdout = FakeStdout(self.lines)
+        return self
+
+    def kill(self):
+        self.killed = True
+        self.rc = -9
+
+    def wait(self):
+        return self.rc
+
+
+class FakeStdout(object):
+    def __init__(self, lines):
+        self.lines = lines
+        self.read = 0
+
+    def __iter__(self):
+        for line in self.lines:
+            self.read += 1
+            yield line
+
+    def close(self):
+        pass
+
+
+DLS_LINES = [
+    b"USER.PS1 PS FB 80 VOL001\n",
+    b"USER.PDS1 PO FB 80 VOL001\n",
+    b"USER.PS2 PS VB 255 VOL002\n",
+    b"\n",
+    b"USER.PS3 PS FB 80 VOL002\n",
+]
+
+
+def test_data_set_filter(zos_find_mocker, mocker):
+    dls = FakeDls(DLS_LINES, stderr=b"BGYSC1005I USER.PS1\nBGYSC1005I USER.PS2\n")
+    mocker.patch.object(zos_find_mocker, "Popen", dls)
+    result = zos_find_mocker.data_set_filter(DummyModule(), None, ["USER.*"])
+    assert result == dict(
+        ps=set(["USER.PS1", "USER.PS2", "USER.PS3"]),
+        pds={"USER.PDS1": {}},
+        searched=2,
+    )
+    assert dls.args[-1] == "USER.*"
+    assert not dls.killed
+
+
+def test_data_set_filter_stops_at_limit(zos_find_mocker, mocker):
+    dls = FakeDls(DLS_LINES)
+    mocker.patch.object(zos_find_mocker, "Popen", dls)
+    result = zos_find_mocker.data_set_filter(DummyModule(), None, ["USER.*"], limit=2)
+    assert result["ps"] == set(["USER.PS1"])
+    assert result["pds"] == {"USER.PDS1": {}}
+    assert dls.killed
+    assert dls.stdout.read == 2
+
+
+def test_data_set_filter_pattern_without_match(zos_find_mocker, mocker):
+    dls = FakeDls(DLS_LINES[:1], rc=1, stderr=b"BGYSC1103E No datasets match pattern: XYZ.*\n")
+    mocker.patch.object(zos_find_mocker, "Popen", dls)
+    result = zos_find_mocker.data_set_filter(DummyModule(), None, ["USER.*", "XYZ.*"])
+    assert result["ps"] == set(["USER.PS1"])
+
+
+def test_data_set_filter_fails(zos_find_mocker, mocker):
+    dls = FakeDls([], rc=8, stderr=b"BGYSC1001E Unexpected error\n")
+    mocker.patch.object(zos_find_mocker, "Popen", dls)
+    with pytest.raises(DummyFailure, match="'dls'"):
+        zos_find_mocker.data_set_filter(DummyModule(), None, ["USER.*"])
+
+
+def test_data_set_filter_cannot_run_dls(zos_find_mocker, mocker):
+    mocker.patch.object(
+        zos_find_mocker, "Popen", side_effect=OSError(2, "No such file or directory")
+    )
+    with pytest.raises(DummyFailure, match="Unable to run ZOAU shell command 'dls'"):
+        zos_find_mocker.data_set_filter(DummyModule(), None, ["USER.*"])
+
+
+VSAM_ENTRIES = [
+    ("USER.VSAM.KSDS", "2000/01/01"),
+    ("USER.VSAM.KSDS.DATA", "2000/01/01"),
+    ("USER.VSAM.KSDS.INDEX", "2000/01/01"),
+    ("USER.VSAM.ESDS", "2999/01/01"),
+    ("USER.VSAM.ESDS.DATA", "2999/01/01"),
+]
+
+# 'dls -t vsam -u' prints the name and the referenced date
+DLS_VSAM_OUT = "".join("{0} {1}\n".format(*entry) for entry in VSAM_ENTRIES)
+
+# 'vls -l' prints the name, the date and then the volume and other details
+VLS_OUT = "".join(
+    "{0:<44} {1} VOL001 KSDS 1 CYL\n".format(*entry) for entry in VSAM_ENTRIES
+)
+
+
+class VsamModule(DummyModule):
+    """Answers the VSAM listing commands with the sample listings."""
+
+    def __init__(self, dls_rc=0, dls_stderr=""):
+        self.dls_rc = dls_rc
+        self.dls_stderr = dls_stderr
+        self.commands = []
+
+    def run_command(self, args, **kwargs):
+        self.commands.append(args)
+        if args[0] == "dls":
+            return self.dls_rc, DLS_VSAM_OUT if self.dls_rc == 0 else "", self.dls_stderr
+        return 0, VLS_OUT, ""
+
+
+DLS_VSAM_CMD = ["dls", "-t", "vsam", "-u", "USER.VSAM.*"]
+VLS_CMD = ["vls", "-l", "USER.VSAM.*"]
+
+
+@pytest.mark.parametrize(
+    "version,command",
+    [
+        (None, VLS_CMD),
+        ("1.1.1", VLS_CMD),
+        ("1.4.0", DLS_VSAM_CMD),
+    ],
+)
+@pytest.mark.parametrize(
+    "resource_type,age,expected",
+    [
+        ("CLUSTER", None, ["USER.VSAM.ESDS", "USER.VSAM.KSDS"]),
+        ("DATA", None, ["USER.VSAM.ESDS.DATA", "USER.VSAM.KSDS.DATA"]),
+        ("INDEX", None, ["USER.VSAM.KSDS.INDEX"]),
+        ("CLUSTER", 1, ["USER.VSAM.KSDS"]),
+        ("DATA", 1, ["USER.VSAM.KSDS.DATA"]),
+    ],
+)
+def test_vsam_filter(zos_find_mocker, mocker, version, command, resource_type, age, expected):
+    mocker.patch.object(zos_find_mocker, "ZOAU_API_VERSION", version)
+    module = VsamModule()
+    result = zos_find_mocker.vsam_filter(module, ["USER.VSAM.*"], resource_type, age=age)
+    assert sorted(result) == expected
+    assert module.commands == [command]
+
+
+def test_vsam_filter_without_match(zos_find_mocker, mocker):
+    mocker.patch.object(zos_find_mocker, "ZOAU_API_VERSION", "1.4.0")
+    module = VsamModule(1, "BGYSC1103E No datasets match pattern: USER.VSAM.*\n")
+    assert zos_find_mocker.vsam_filter(module, ["USER.VSAM.*"], "CLUSTER") == set()
+
+
+def test_vsam_filter_fails(zos_find_mocker, mocker):
+    mocker.patch.object(zos_find_mocker, "ZOAU_API_VERSION", "1.4.0")
+    module = VsamModule(8, "BGYSC1001E Unexpected error\n")
+    with pytest.raises(DummyFailure, match="'dls'"):
+        zos_find_mocker.vsam_filter(module, ["USER.VSAM.*"], "CLUSTER")
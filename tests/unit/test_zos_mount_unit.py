@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2021
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+IMPORT_NAME = "ibm_zos_core.plugins.modules.zos_mount"
+
+HEADER = (
+    "/* BPXPRM header comment */\n"
+    "/* more header */\n"
+)
+
+ROOT = "ROOT FILESYSTEM('OMVS.ROOT') TYPE(ZFS) MODE(RDWR)\n"
+
+UNMANAGED = (
+    "MOUNT FILESYSTEM('OMVS.ETC')\n"
+    "      MOUNTPOINT('/etc')\n"
+    "      TYPE(ZFS)\n"
+)
+
+
+def managed_block(name, stamp="20210101-000000", path="/tmp/a"):
+    return (
+        "/* BEGIN ANSIBLE MANAGED BLOCK {1} */\n"
+        "/* C1:added by zos_mount */\n"
+        "MOUNT FILESYSTEM('{0}')\n"
+        "      MOUNTPOINT('{2}')\n"
+        "      TYPE('ZFS')\n"
+        "      MODE(RDWR)\n"
+        "      SECURITY\n"
+        "/* END ANSIBLE MANAGED BLOCK {1} */\n"
+    ).format(name, stamp, path)
+
+
+DF_OUT = (
+    "Mounted on     Filesystem                Avail/Total    Files      Status    \n"
+    "/tmp           (OMVS.TMP.ZFS)            1936208/2160000 4294967200 Available\n"
+    "/u/user        (USER.ZFS.OLD)            248/1440       4294967247 Available\n"
+    "/u/user/new    (USER.ZFS)                1100/1440      4294967290 Available\n"
+    "/              (OMVS.ROOT)               131536/4332960 4294936321 Available\n"
+)
+
+
+class DummyModule(object):
+    """Used in place of Ansible's module
+    so we can easily mock the desired behavior."""
+
+    def __init__(self, rc=0, stdout="", stderr=""):
+        self.rc = rc
+        self.stdout = stdout
+        self.stderr = stderr
+        self.commands = []
+
+    def run_command(self, args, **kwargs):
+        self.commands.append(args)
+        return self.rc, self.stdout, self.stderr
+
+
+@pytest.fixture(scope="function")
+def zos_mount_mocker(zos_import_mocker):
+    """Pytest fixture in charge of patching unavailable imports
+    so we can run z/OS module test cases on x86 for zos_mount.
+
+    Args:
+        zos_import_mocker (zos_import_mocker): A pytest fixture
+
+    Yields:
+        object: The zos_mount module object
+    """
+    mocker, importer = zos_import_mocker
+    zos_mount = importer(IMPORT_NAME)
+    yield zos_mount
+
+
+@pytest.mark.parametrize(
+    "original,expected",
+    [
+        # managed block at the top of the member
+        (
+            managed_block("Y.ZFS") + ROOT + UNMANAGED,
+            ROOT + UNMANAGED,
+        ),
+        # managed block between other statements
+        (
+            ROOT + managed_block("Y.ZFS") + UNMANAGED,
+            ROOT + UNMANAGED,
+        ),
+        # managed block at the end of the member
+        (
+            ROOT + UNMANAGED + managed_block("Y.ZFS"),
+            ROOT + UNMANAGED,
+        ),
+        # managed block at the end, without a final newline
+        (
+            ROOT + managed_block("Y.ZFS").rstrip("\n"),
+            ROOT,
+        ),
+        # comment header right above the BEGIN marker
+        (
+            HEADER + managed_block("Y.ZFS"),
+            HEADER,
+        ),
+        # adjacent managed blocks
+        (
+            managed_block("X.ZFS") + managed_block("Y.ZFS") + managed_block("Z.ZFS"),
+            managed_block("X.ZFS") + managed_block("Z.ZFS"),
+        ),
+        # every entry for the file system is removed
+        (
+            managed_block("Y.ZFS") + ROOT + managed_block("Y.ZFS", "20210202-000000"),
+            ROOT,
+        ),
+        # no entry for the file system
+        (
+            HEADER + ROOT + managed_block("X.ZFS"),
+            HEADER + ROOT + managed_block("X.ZFS"),
+        ),
+        # a name that only shares a prefix with the file system
+        (
+            managed_block("Y.ZFS.OLD") + managed_block("Y.ZF"),
+            managed_block("Y.ZFS.OLD") + managed_block("Y.ZF"),
+        ),
+    ],
+)
+def test_swap_text_removes_managed_block(zos_mount_mocker, original, expected):
+    assert zos_mount_mocker.swap_text(original, "", "Y.ZFS") == expected
+
+
+def test_swap_text_removes_statement_without_managed_block(zos_mount_mocker):
+    original = HEADER + ROOT + UNMANAGED + managed_block("X.ZFS")
+    assert zos_mount_mocker.swap_text(original, "", "OMVS.ETC") == (
+        HEADER + ROOT + managed_block("X.ZFS")
+    )
+
+    a_stmt = "MOUNT FILESYSTEM('A.ZFS')\n      MOUNTPOINT('/a')\n"
+    b_stmt = "MOUNT FILESYSTEM('B.ZFS')\n      MOUNTPOINT('/b')\n"
+    comment = "/* The B file system holds the product */\n"
+    original = a_stmt + comment + b_stmt
+    assert zos_mount_mocker.swap_text(original, "", "A.ZFS") == comment + b_stmt
+
+    # an indented statement ends the entry
+    indented = "  MOUNT FILESYSTEM('B.ZFS')\n  ROOT FILESYSTEM('OMVS.ROOT')\n"
+    original = a_stmt + indented + "      (continued by hand)\n"
+    assert zos_mount_mocker.swap_text(original, "", "A.ZFS") == (
+        indented + "      (continued by hand)\n"
+    )
+    assert zos_mount_mocker.swap_text(a_stmt + indented, "", "B.ZFS") == (
+        a_stmt + "  ROOT FILESYSTEM('OMVS.ROOT')\n"
+    )
+
+    # statements are free-format, so an operand may start in column 1
+    original = "MOUNT FILESYSTEM('Y.ZFS')\nMOUNTPOINT('/a')\n" + ROOT
+    assert zos_mount_mocker.swap_text(original, "", "Y.ZFS") == ROOT
+
+    # a value that spans lines is removed along with the statement
+    original = (
+        "MOUNT FILESYSTEM('A.ZFS')\n  MOUNTPOINT('/a')\n  PARM('x,\n        y')\nZ\n"
+    )
+    assert zos_mount_mocker.swap_text(original, "NEW\n", "A.ZFS") == "NEW\nZ\n"
+    original = "MOUNT FILESYSTEM('A.ZFS') PARM('x,\ny') AUTOMOVE(INCLUDE,\nSY1)\n" + ROOT
+    assert zos_mount_mocker.swap_text(original, "", "A.ZFS") == ROOT
+    original = a_stmt + "      (continued by hand)\n" + ROOT
+    assert zos_mount_mocker.swap_text(original, "", "A.ZFS") == ROOT
+
+    # quotes in a comment do not continue the statement
+    original = "MOUNT FILESYSTEM('A.ZFS') /* don't */\n" + ROOT + "/* it's */\n"
+    assert zos_mount_mocker.swap_text(original, "", "A.ZFS") == ROOT + "/* it's */\n"
+
+
+@pytest.mark.parametrize(
+    "name,statement",
+    [
+        ("Y.ZFS", "mount filesystem('y.zfs')"),
+        ("y.zfs", "MOUNT FILESYSTEM('Y.ZFS')"),
+        ("Y.zfs", "Mount FileSystem( 'y.ZFS' )"),
+    ],
+)
+def test_swap_text_mixed_case(zos_mount_mocker, name, statement):
+    original = ROOT + managed_block("Y.ZFS").replace(
+        "MOUNT FILESYSTEM('Y.ZFS')", statement
+    )
+    assert zos_mount_mocker.swap_text(original, "", name) == ROOT
+
+
+def test_swap_text_adds_entry(zos_mount_mocker):
+    adding = managed_block("Y.ZFS", "20210303-000000", "/tmp/b")
+    original = ROOT + managed_block("Y.ZFS") + UNMANAGED
+    assert zos_mount_mocker.swap_text(original, adding, "Y.ZFS") == (
+        ROOT + adding + UNMANAGED
+    )
+    original = ROOT + managed_block("Y.ZFS") + UNMANAGED + managed_block("Y.ZFS")
+    assert zos_mount_mocker.swap_text(original, adding, "Y.ZFS") == (
+        ROOT + adding + UNMANAGED
+    )
+    assert zos_mount_mocker.swap_text(ROOT + UNMANAGED, adding, "Y.ZFS") == (
+        ROOT + UNMANAGED + adding
+    )
+    assert zos_mount_mocker.swap_text(ROOT.rstrip("\n"), adding, "Y.ZFS") == (
+        ROOT + adding
+    )
+    assert zos_mount_mocker.swap_text("", adding, "Y.ZFS") == adding
+
+
+def test_empty_records_are_removed(zos_mount_mocker):
+    content = ROOT + "\n\n" + "\x00\x00\x00\n" + UNMANAGED + "\n"
+    assert zos_mount_mocker.EMPTY_RECORD_REGEX.sub("", content) == ROOT + UNMANAGED
+
+
+def test_same_managed_text_ignores_timestamps(zos_mount_mocker):
+    original = HEADER + ROOT + managed_block("Y.ZFS")
+    updated = zos_mount_mocker.swap_text(
+        original, managed_block("Y.ZFS", "20211111-111111"), "Y.ZFS"
+    )
+    assert updated != original
+    assert zos_mount_mocker.same_managed_text(original, updated)
+
+
+def test_same_managed_text_on_repeated_runs(zos_mount_mocker):
+    original = HEADER + ROOT + managed_block("X.ZFS") + managed_block("Y.ZFS")
+    for name in ("X.ZFS", "Y.ZFS"):
+        updated = zos_mount_mocker.swap_text(
+            original, managed_block(name, "20211111-111111"), name
+        )
+        assert zos_mount_mocker.same_managed_text(original, updated)
+
+
+def test_same_managed_text_ignores_trailing_blanks(zos_mount_mocker):
+    original = HEADER + ROOT + managed_block("Y.ZFS")
+    padded = "".join(line.ljust(80) + "\n" for line in original.splitlines())
+    assert zos_mount_mocker.same_managed_text(padded, original + "\n")
+
+
+@pytest.mark.parametrize(
+    "updated",
+    [
+        HEADER + ROOT + managed_block("Y.ZFS", "20211111-111111", "/tmp/b"),
+        HEADER + ROOT,
+        ROOT + managed_block("Y.ZFS", "20211111-111111"),
+        HEADER + managed_block("Y.ZFS", "20211111-111111") + ROOT,
+    ],
+)
+def test_same_managed_text_detects_changes(zos_mount_mocker, updated):
+    original = HEADER + ROOT + managed_block("Y.ZFS")
+    assert not zos_mount_mocker.same_managed_text(original, updated)
+
+
+def test_get_mounted_file_systems(zos_mount_mocker):
+    module = DummyModule(stdout=DF_OUT)
+    assert zos_mount_mocker.get_mounted_file_systems(module) == set(
+        ["OMVS.TMP.ZFS", "USER.ZFS.OLD", "USER.ZFS", "OMVS.ROOT"]
+    )
+    assert module.commands == [["df"]]
+
+    module = DummyModule(stdout=DF_OUT.splitlines(True)[0] + DF_OUT.splitlines(True)[2])
+    assert zos_mount_mocker.get_mounted_file_systems(module, "/u/user") == set(
+        ["USER.ZFS.OLD"]
+    )
+    assert module.commands == [["df", "/u/user"]]
+
+
+def test_get_mounted_file_systems_fails(zos_mount_mocker):
+    module = DummyModule(rc=1, stderr="df: /u/none: No such file or directory")
+    assert zos_mount_mocker.get_mounted_file_systems(module, "/u/none") is None